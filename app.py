@@ -10,7 +10,7 @@ from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
 from models.sign_language_model import SignLanguageModel
 from utils.video_feed import generate_frames, process_frame
-from utils.postprocessing import form_sentence
+from utils.postprocessing import form_sentence, sentence_diff
 
 if not os.path.exists('logs'):
     os.mkdir('logs')
@@ -31,8 +31,22 @@ file_handler.setFormatter(logging.Formatter(
 logger.addHandler(file_handler)
 logger.info('SignTalk startup')
 
+def caption_flush_interval(default=0.15):
+    value = os.environ.get('CAPTION_FLUSH_INTERVAL')
+    if value is None:
+        return default
+    try:
+        interval = float(value)
+    except ValueError:
+        interval = -1
+    if interval < 0:
+        logger.warning(f"Invalid CAPTION_FLUSH_INTERVAL {value!r}, using {default}s")
+        return default
+    return interval
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'default-dev-key')
+app.config['CAPTION_FLUSH_INTERVAL'] = caption_flush_interval()
 CORS(app)
 
 socketio = SocketIO(
@@ -64,6 +78,64 @@ last_prediction_time = {}
 prediction_threshold = 0.6
 cooldown_period = 0.5
 
+# client_id -> {'room', 'sid', 'sent', 'pending'} for prediction sessions linked to a call room
+caption_sessions = {}
+caption_flush_scheduled = set()
+caption_last_flush = {}
+
+def current_sentence(user_id):
+    history = prediction_history.get(user_id, [])
+    try:
+        return form_sentence(history)
+    except Exception:
+        logger.warning("Fallback: using raw prediction history for sentence")
+        return " ".join(history)
+
+def reset_caption(client_id, session, sentence):
+    session['sent'] = session['pending'] = sentence
+    socketio.emit('receive_text', {'sender': client_id, 'sentence': sentence},
+                  room=session['room'], skip_sid=session['sid'])
+
+def drop_caption_session(client_id):
+    session = caption_sessions.pop(client_id, None)
+    if session is not None:
+        reset_caption(client_id, session, "")
+
+def queue_caption(client_id, sentence):
+    session = caption_sessions.get(client_id)
+    if session is None:
+        return
+    session['pending'] = sentence
+    room = session['room']
+    if session['pending'] == session['sent'] or room in caption_flush_scheduled:
+        return
+    # Leading-edge throttle: send now unless the room flushed within the interval
+    wait = caption_last_flush.get(room, 0) + app.config['CAPTION_FLUSH_INTERVAL'] - time.time()
+    if wait <= 0:
+        flush_captions(room)
+    else:
+        caption_flush_scheduled.add(room)
+        socketio.start_background_task(flush_captions_later, room, wait)
+
+def flush_captions_later(room, delay):
+    socketio.sleep(delay)
+    caption_flush_scheduled.discard(room)
+    flush_captions(room)
+
+def flush_captions(room):
+    caption_last_flush[room] = time.time()
+    for client_id, session in list(caption_sessions.items()):
+        if session['room'] != room or session['pending'] == session['sent']:
+            continue
+        payload = {'sender': client_id, 'base': len(session['sent'])}
+        trim, prepend, delete, append = sentence_diff(session['sent'], session['pending'])
+        # Only the non-empty edits go on the wire; receivers default the rest
+        for key, value in (('trim', trim), ('prepend', prepend), ('delete', delete), ('append', append)):
+            if value:
+                payload[key] = value
+        session['sent'] = session['pending']
+        socketio.emit('receive_text', payload, room=room, skip_sid=session['sid'])
+
 @app.errorhandler(Exception)
 def handle_error(e):
     logger.error(f"Unhandled exception: {e}")
@@ -139,11 +211,8 @@ def predict():
                 if len(prediction_history[user_id]) > 10:
                     prediction_history[user_id].pop(0)
 
-        try:
-            sentence = form_sentence(prediction_history[user_id])
-        except Exception:
-            logger.warning("Fallback: using raw prediction history for sentence")
-            sentence = " ".join(prediction_history[user_id])
+        sentence = current_sentence(user_id)
+        queue_caption(user_id, sentence)
 
         return jsonify({
             "prediction": prediction,
@@ -158,8 +227,9 @@ def predict():
 
 @app.route('/clear_history', methods=['POST'])
 def clear_history():
-    user_id = request.sid if hasattr(request, 'sid') else 'default'
+    user_id = request.args.get('client_id') or request.remote_addr
     prediction_history[user_id] = []
+    queue_caption(user_id, "")
     return jsonify({"status": "success"})
 
 @app.route('/available_signs')
@@ -193,6 +263,39 @@ def handle_join(data):
         'count': len(rooms[room])
     }, room=request.sid)
     emit('user_joined', {'count': len(rooms[room])}, room=room, include_self=False)
+    for client_id, session in list(caption_sessions.items()):
+        if session['room'] == room and session['sid'] != request.sid:
+            emit('receive_text', {'sender': client_id, 'sentence': session['sent']}, room=request.sid)
+
+@socketio.on('link_prediction')
+def handle_link_prediction(data):
+    room = data.get('room', '')
+    client_id = data.get('client_id', '')
+    if not room or not client_id or request.sid not in rooms.get(room, []):
+        emit('prediction_link_failed', {'room': room}, room=request.sid)
+        return
+    session = caption_sessions.get(client_id)
+    if session is not None and session['sid'] != request.sid:
+        logger.warning(f"Refusing to link {client_id} from {request.sid}: owned by {session['sid']}")
+        emit('prediction_link_failed', {'room': room}, room=request.sid)
+        return
+    if session is not None and session['room'] != room:
+        drop_caption_session(client_id)
+    session = caption_sessions.setdefault(client_id, {'room': room})
+    session['sid'] = request.sid
+    # Start every link from a full snapshot so later diffs share the receivers' baseline
+    reset_caption(client_id, session, current_sentence(client_id))
+    # Clear anything this socket relayed through sign_text before it was linked
+    emit('receive_text', {'sender': request.sid, 'sentence': ""}, room=room, include_self=False)
+    emit('prediction_linked', {'room': room}, room=request.sid)
+
+@socketio.on('caption_resync')
+def handle_caption_resync(data):
+    room = data.get('room', '')
+    client_id = data.get('sender', '')
+    session = caption_sessions.get(client_id)
+    if session is not None and session['room'] == room and request.sid in rooms.get(room, []):
+        emit('receive_text', {'sender': client_id, 'sentence': session['sent']}, room=request.sid)
 
 @socketio.on('leave')
 def handle_leave(data):
@@ -200,9 +303,13 @@ def handle_leave(data):
     if room and request.sid in rooms.get(room, []):
         leave_room(room)
         rooms[room].remove(request.sid)
+        for client_id in [c for c, session in caption_sessions.items()
+                          if session['sid'] == request.sid and session['room'] == room]:
+            drop_caption_session(client_id)
         emit('user_left', {'count': len(rooms[room])}, room=room)
         if not rooms[room]:
             del rooms[room]
+            caption_last_flush.pop(room, None)
 
 @socketio.on('disconnect')
 def handle_disconnect():
@@ -214,16 +321,22 @@ def handle_disconnect():
             emit('user_left', {'count': len(rooms[room_name])}, room=room_name)
             if not rooms[room_name]:
                 del rooms[room_name]
+                caption_last_flush.pop(room_name, None)
     prediction_history.pop(sid, None)
     last_prediction.pop(sid, None)
     last_prediction_time.pop(sid, None)
+    for client_id in [c for c, session in caption_sessions.items() if session['sid'] == sid]:
+        drop_caption_session(client_id)
 
 @socketio.on('sign_text')
 def handle_sign_text(data):
     room = data.get('room', '')
     sentence = data.get('sentence', '')
+    client_id = data.get('client_id', '')
+    session = caption_sessions.get(client_id)
+    sender = client_id if session is not None and session['sid'] == request.sid else request.sid
     if room:
-        emit('receive_text', {'sentence': sentence}, room=room, include_self=False)
+        emit('receive_text', {'sender': sender, 'sentence': sentence}, room=room, include_self=False)
 
 @socketio.on('offer')
 def handle_offer(data):
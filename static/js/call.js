@@ -3,6 +3,7 @@ let peerConnection;
 let roomName = "";
 let isInitiator = false;
 let iceCandidatesQueue = []; 
+let receivedSentences = {};
 
 const config = {
   iceServers: [
@@ -139,21 +140,33 @@ window.socket.on("user_left", ({ count }) => {
       remoteVideo.srcObject = null;
     }
     
+    receivedSentences = {};
     if (receivedTextElement) {
       receivedTextElement.textContent = "Waiting for partner to join...";
     }
   }
 });
 
-window.socket.on("receive_text", ({ sentence }) => {
-  if (receivedTextElement) {
-    if (sentence !== undefined) {
-      receivedTextElement.textContent = sentence || "Waiting for signs...";
-      receivedTextElement.classList.add('new-text');
-      setTimeout(() => {
-        receivedTextElement.classList.remove('new-text');
-      }, 500);
+window.socket.on("receive_text", ({ sender = "", sentence, base, trim = 0, prepend = "", delete: deleteCount = 0, append = "" }) => {
+  if (sentence !== undefined) {
+    receivedSentences[sender] = sentence;
+  } else {
+    // Server-pushed captions only carry the characters that changed at either end of the sender's text
+    const current = receivedSentences[sender] ?? (base === 0 ? "" : undefined);
+    if (current === undefined || current.length !== base) {
+      console.warn(`[WARN] Caption diff from ${sender} does not match local text, requesting resync`);
+      window.socket.emit("caption_resync", { room: window.roomName, sender });
+      return;
     }
+    receivedSentences[sender] = prepend + current.slice(trim, current.length - deleteCount) + append;
+  }
+  if (receivedTextElement) {
+    const text = Object.values(receivedSentences).filter(Boolean).join(" | ");
+    receivedTextElement.textContent = text || "Waiting for signs...";
+    receivedTextElement.classList.add('new-text');
+    setTimeout(() => {
+      receivedTextElement.classList.remove('new-text');
+    }, 500);
   }
 });
 
@@ -6,6 +6,8 @@ let lastPredictionTime = 0;
 let clientId = 'client_' + Math.random().toString(36).substring(2, 9);
 let failedAttempts = 0;
 let backoffDelay = 1000;
+let captionsLinked = false;
+let linkPending = false;
 const predictionThreshold = 0.6;
 const cooldownPeriod = 500; 
 
@@ -15,6 +17,25 @@ document.addEventListener('DOMContentLoaded', () => {
     if (isDeafMode) {
         console.log("[SIGN] Deaf mode detected, will start camera + capture");
 
+        if (window.socket) {
+            window.socket.on('joined_room', linkPredictionSession);
+            window.socket.on('connect', linkPredictionSession);
+            window.socket.on('disconnect', () => {
+                captionsLinked = false;
+                linkPending = false;
+            });
+            window.socket.on('prediction_link_failed', ({ room }) => {
+                linkPending = false;
+                captionsLinked = false;
+                console.warn(`[WARN] Server refused to push captions to room: ${room}`);
+            });
+            window.socket.on('prediction_linked', ({ room }) => {
+                linkPending = false;
+                captionsLinked = room === window.roomName;
+                console.log(`[SIGN] Captions are pushed by the server to room: ${room}`);
+            });
+        }
+
         if (typeof startLocalVideo === 'function') {
             startLocalVideo();
         } else {
@@ -32,6 +53,16 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 });
 
+function linkPredictionSession() {
+    if (window.socket && window.roomName) {
+        linkPending = true;
+        window.socket.emit('link_prediction', {
+            room: window.roomName,
+            client_id: clientId
+        });
+    }
+}
+
 function startSignDetection(videoElement) {
     if (isCapturing) return;
     isCapturing = true;
@@ -155,11 +186,15 @@ function processSignPrediction(data) {
 
 function sendSignText(sentence) {
     if (sentence && window.socket && window.roomName) {
-        console.log(`[SIGN] Sending text: "${sentence}"`);
-        window.socket.emit('sign_text', {
-            room: window.roomName,
-            sentence: sentence
-        });
+        // Once linked (or while the link is in flight) the server pushes captions itself
+        if (!captionsLinked && !linkPending && window.socket.connected) {
+            console.log(`[SIGN] Sending text: "${sentence}"`);
+            window.socket.emit('sign_text', {
+                room: window.roomName,
+                client_id: clientId,
+                sentence: sentence
+            });
+        }
 
         const sentElement = document.getElementById('sentText');
         if (sentElement) {
@@ -171,7 +206,7 @@ function sendSignText(sentence) {
 function clearSignHistory() {
     predictionHistory = [];
 
-    fetch('/clear_history', {
+    fetch(`/clear_history?client_id=${clientId}`, {
         method: 'POST'
     })
     .then(response => response.json())
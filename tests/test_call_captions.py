@@ -0,0 +1,155 @@
+import io
+
+import cv2
+import numpy as np
+import pytest
+
+import app as signtalk
+
+_, FRAME = cv2.imencode('.jpg', np.zeros((8, 8, 3), np.uint8))
+
+
+@pytest.fixture
+def signs(monkeypatch):
+    queued = []
+    monkeypatch.setattr(signtalk, 'get_model', lambda: object())
+    monkeypatch.setattr(signtalk, 'process_frame', lambda frame, model: (frame, queued.pop(0), 0.9))
+    monkeypatch.setitem(signtalk.app.config, 'CAPTION_FLUSH_INTERVAL', 0)
+    for state in (signtalk.prediction_history, signtalk.last_prediction, signtalk.last_prediction_time,
+                  signtalk.rooms, signtalk.caption_sessions, signtalk.caption_flush_scheduled,
+                  signtalk.caption_last_flush):
+        state.clear()
+    return queued
+
+
+def predict(signs, sign, client_id='c1'):
+    signs.append(sign)
+    response = signtalk.app.test_client().post(
+        f'/predict?client_id={client_id}',
+        data={'frame': (io.BytesIO(FRAME.tobytes()), 'frame.jpg')},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+    return response.get_json()['sentence']
+
+
+def joined(*room_names):
+    client = signtalk.socketio.test_client(signtalk.app)
+    for room in room_names:
+        client.emit('join', {'room': room})
+    client.get_received()
+    return client
+
+
+def link(client, room, client_id='c1'):
+    client.emit('link_prediction', {'room': room, 'client_id': client_id})
+    return [m['name'] for m in client.get_received()]
+
+
+def captions(client, sender='c1'):
+    return [m['args'][0] for m in client.get_received()
+            if m['name'] == 'receive_text' and m['args'][0]['sender'] == sender]
+
+
+def test_link_requires_room_membership(signs):
+    outsider = joined()
+    assert link(outsider, 'r1') == ['prediction_link_failed']
+    assert 'c1' not in signtalk.caption_sessions
+
+
+def test_link_refuses_client_id_owned_by_another_socket(signs):
+    deaf, intruder = joined('r1'), joined('r1', 'r2')
+    assert 'prediction_linked' in link(deaf, 'r1')
+    names = link(intruder, 'r2')
+    assert 'prediction_link_failed' in names
+    assert 'prediction_linked' not in names
+    assert signtalk.caption_sessions['c1']['room'] == 'r1'
+
+
+def test_link_sends_snapshot_then_diffs_only_on_change(signs):
+    deaf, partner = joined('r1'), joined('r1')
+    assert predict(signs, 'a') == 'A'
+    link(deaf, 'r1')
+    assert captions(partner) == [{'sender': 'c1', 'sentence': 'A'}]
+
+    predict(signs, 'b')
+    assert captions(partner) == [{'sender': 'c1', 'base': 1, 'append': 'b'}]
+
+    predict(signs, 'nothing')
+    assert captions(partner) == []
+    assert captions(deaf) == []
+
+
+def test_flushes_are_coalesced_per_room(signs, monkeypatch):
+    monkeypatch.setitem(signtalk.app.config, 'CAPTION_FLUSH_INTERVAL', 60)
+    deaf, partner = joined('r1'), joined('r1')
+    link(deaf, 'r1')
+    partner.get_received()
+
+    predict(signs, 'a')
+    assert captions(partner) == [{'sender': 'c1', 'base': 0, 'append': 'A'}]
+
+    predict(signs, 'b')
+    predict(signs, 'c')
+    assert captions(partner) == []
+    assert 'r1' in signtalk.caption_flush_scheduled
+
+    signtalk.flush_captions('r1')
+    assert captions(partner) == [{'sender': 'c1', 'base': 1, 'append': 'bc'}]
+
+
+def test_late_joiner_gets_snapshot(signs):
+    deaf = joined('r1')
+    link(deaf, 'r1')
+    predict(signs, 'a')
+
+    newcomer = signtalk.socketio.test_client(signtalk.app)
+    newcomer.emit('join', {'room': 'r1'})
+    assert captions(newcomer) == [{'sender': 'c1', 'sentence': 'A'}]
+
+
+def test_relink_resets_old_room(signs):
+    deaf, first, second = joined('r1', 'r2'), joined('r1'), joined('r2')
+    link(deaf, 'r1')
+    predict(signs, 'a')
+    first.get_received()
+    second.get_received()
+
+    link(deaf, 'r2')
+    assert captions(first) == [{'sender': 'c1', 'sentence': ''}]
+    assert captions(second) == [{'sender': 'c1', 'sentence': 'A'}]
+
+
+@pytest.mark.parametrize('depart', [
+    lambda client: client.emit('leave', {'room': 'r1'}),
+    lambda client: client.disconnect(),
+])
+def test_leaving_resets_caption(signs, depart):
+    deaf, partner = joined('r1'), joined('r1')
+    link(deaf, 'r1')
+    predict(signs, 'a')
+    partner.get_received()
+
+    depart(deaf)
+    assert captions(partner) == [{'sender': 'c1', 'sentence': ''}]
+    assert 'c1' not in signtalk.caption_sessions
+
+
+def test_sign_text_cannot_claim_another_sender(signs):
+    deaf, intruder, partner = joined('r1'), joined('r1'), joined('r1')
+    link(deaf, 'r1')
+    partner.get_received()
+
+    intruder.emit('sign_text', {'room': 'r1', 'client_id': 'c1', 'sentence': 'spoof'})
+    received = [m['args'][0] for m in partner.get_received() if m['name'] == 'receive_text']
+    assert len(received) == 1
+    assert received[0]['sender'] != 'c1'
+
+
+def test_resync_requires_room_membership(signs):
+    deaf, outsider = joined('r1'), joined()
+    link(deaf, 'r1')
+    predict(signs, 'a')
+
+    outsider.emit('caption_resync', {'room': 'r1', 'sender': 'c1'})
+    assert captions(outsider) == []
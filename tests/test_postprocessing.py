@@ -0,0 +1,22 @@
+from utils.postprocessing import sentence_diff
+
+
+def test_sentence_diff_from_empty():
+    assert sentence_diff("", "Hi") == (0, "", 0, "Hi")
+
+
+def test_sentence_diff_appended_word_replaces_trailing_period():
+    assert sentence_diff("Hi.", "Hi you.") == (0, "", 1, " you.")
+
+
+def test_sentence_diff_cleared():
+    assert sentence_diff("Hi you", "") == (0, "", 6, "")
+
+
+def test_sentence_diff_unchanged():
+    assert sentence_diff("Hi you", "Hi you") == (0, "", 0, "")
+
+
+def test_sentence_diff_sliding_window_trims_front():
+    # A full 10-sign window drops its oldest sign and re-capitalizes the new first letter
+    assert sentence_diff("Helloworld", "Elloworldt") == (2, "E", 0, "t")
@@ -1,6 +1,7 @@
 import re
 import nltk
 from collections import Counter
+from difflib import SequenceMatcher
 
 try:
     nltk.download('punkt', quiet=True)
@@ -133,4 +134,12 @@ def clean_and_format_sentence(sentence):
     if sentence and not re.search(r'[.!?]$', sentence):
         sentence += '.'
     
-    return sentence.strip()     
\ No newline at end of file
+    return sentence.strip()
+
+def sentence_diff(old, new):
+    """Return (trim, prepend, delete, append) so that
+    new == prepend + old[trim:len(old) - delete] + append"""
+    match = SequenceMatcher(None, old, new, autojunk=False).find_longest_match(0, len(old), 0, len(new))
+    if match.size == 0:
+        return 0, "", len(old), new
+    return match.a, new[:match.b], len(old) - match.a - match.size, new[match.b + match.size:]